@@ -9,10 +9,13 @@ from requests.adapters import HTTPAdapter
 from tqdm import tqdm
 import logging
 import re
+import argparse
 from datetime import datetime
+from profiling import profile_run, profiled, phase, stage
 
 # Konfigurasi Optimized
 MAX_PAGES = 223
+PROFILE_MEM_MAX_PAGES = 5  # Batas halaman default untuk --profile-mem (1 worker)
 MAX_WORKERS = 10
 DELAY_RANGE = (0.5, 1.5) 
 REQUEST_TIMEOUT = (10, 20)
@@ -66,17 +69,22 @@ def format_timestamp(date_str):
     except:
         return date_str  # Return original if parsing fails
  
+@profiled('artikel')
 def scrape_article(url, session):
     """Scrape konten artikel individual"""
     try:
-        time.sleep(get_random_delay())
-        response = session.get(url, timeout=REQUEST_TIMEOUT)
+        with stage('jeda'):
+            time.sleep(get_random_delay())
+        with stage('fetch'):
+            response = session.get(url, timeout=REQUEST_TIMEOUT)
+            html = response.text  # decode body (+ deteksi charset) masuk ke fetch, bukan parse
         response.raise_for_status()
 
         if "checkpoint" in response.url.lower():
             raise Exception("Terkena checkpoint/redirect")
 
-        soup = BeautifulSoup(response.text, 'html.parser')
+        with stage('parse'):
+            soup = BeautifulSoup(html, 'html.parser')
 
         # Coba ekstrak dari script pertama (jika ada)
         script_content = soup.find('script', string=lambda t: t and 'keywordBrandSafety' in t)
@@ -114,10 +122,14 @@ def scrape_article(url, session):
             show_all_url = show_all_link['href']
             if not show_all_url.startswith('http'):
                 show_all_url = f"https://www.kompas.com{show_all_url}"
-            time.sleep(get_random_delay())
-            response = session.get(show_all_url, timeout=REQUEST_TIMEOUT)
+            with stage('jeda'):
+                time.sleep(get_random_delay())
+            with stage('fetch'):
+                response = session.get(show_all_url, timeout=REQUEST_TIMEOUT)
+                html = response.text  # decode body (+ deteksi charset) masuk ke fetch, bukan parse
             response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
+            with stage('parse'):
+                soup = BeautifulSoup(html, 'html.parser')
 
         content_div = soup.find('div', class_='read__content')
         full_text = []
@@ -182,20 +194,25 @@ def scrape_article(url, session):
             'error': error_msg
         }
      
+@profiled('halaman')
 def scrape_page(page_num, session):
     """Scrape list artikel dalam satu halaman"""
     try:
-        time.sleep(get_random_delay())
+        with stage('jeda'):
+            time.sleep(get_random_delay())
         url = f"{BASE_URL}/{page_num}" if page_num > 1 else BASE_URL
         logging.info(f"Scraping page: {url}")
         
-        response = session.get(url, timeout=REQUEST_TIMEOUT)
+        with stage('fetch'):
+            response = session.get(url, timeout=REQUEST_TIMEOUT)
+            html = response.text  # decode body (+ deteksi charset) masuk ke fetch, bukan parse
         response.raise_for_status()
         
         if "checkpoint" in response.url.lower():
             raise Exception("Terkena checkpoint/redirect")
             
-        soup = BeautifulSoup(response.text, 'html.parser')
+        with stage('parse'):
+            soup = BeautifulSoup(html, 'html.parser')
         
         # Cari semua artikel - sesuai dengan struktur HTML yang diberikan
         articles = []
@@ -281,7 +298,7 @@ def main():
     
     # Tahap 1: Scrape semua URL artikel
     print("\n🔍 Mengumpulkan URL artikel...")
-    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+    with phase('kumpul_url'), ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
         futures = {executor.submit(scrape_page, page_num, session): page_num 
                   for page_num in range(1, MAX_PAGES + 1)}
         
@@ -307,7 +324,7 @@ def main():
     print("\n📖 Mengambil konten artikel...")
     url_to_index = {article['Url']: idx for idx, article in enumerate(all_data)}
     
-    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+    with phase('konten'), ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
         futures = {executor.submit(scrape_article, article['Url'], session): article['Url'] 
                  for article in all_data}
         
@@ -326,20 +343,23 @@ def main():
     
     # Simpan hasil sementara setiap 1000 data
     chunk_size = 1000
-    for i in range(0, len(all_data), chunk_size):
-        chunk = all_data[i:i + chunk_size]
-        df = pd.DataFrame(chunk)
-        df = df[df['FullText'] != "N/A"]
+    with phase('ekspor'):
+        for i in range(0, len(all_data), chunk_size):
+            chunk = all_data[i:i + chunk_size]
+            df = pd.DataFrame(chunk)
+            df = df[df['FullText'] != "N/A"]
         
-        # Simpan ke XLSX
-        xlsx_output = f"kompas_cekfakta_data_{i//chunk_size + 1}.xlsx"
-        df.to_excel(xlsx_output, index=False)
-        print(f"Disimpan (XLSX): {xlsx_output} ({len(df)} data)")
+            # Simpan ke XLSX
+            xlsx_output = f"kompas_cekfakta_data_{i//chunk_size + 1}.xlsx"
+            with stage('xlsx'):
+                df.to_excel(xlsx_output, index=False)
+            print(f"Disimpan (XLSX): {xlsx_output} ({len(df)} data)")
         
-        # Simpan ke CSV
-        csv_output = f"kompas_cekfakta_data_{i//chunk_size + 1}.csv"
-        df.to_csv(csv_output, index=False, encoding='utf-8-sig')  # utf-8-sig untuk handle karakter khusus
-        print(f"Disimpan (CSV): {csv_output} ({len(df)} data)")
+            # Simpan ke CSV
+            csv_output = f"kompas_cekfakta_data_{i//chunk_size + 1}.csv"
+            with stage('csv'):
+                df.to_csv(csv_output, index=False, encoding='utf-8-sig')  # utf-8-sig untuk handle karakter khusus
+            print(f"Disimpan (CSV): {csv_output} ({len(df)} data)")
     
     error_urls = [article['Url'] for article in all_data if article['FullText'] == "N/A"]
     if error_urls:
@@ -350,4 +370,27 @@ def main():
     print("\n🎉 Selesai! Semua data berita telah disimpan.")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Scraper Kompas Cek Fakta")
+    profile_group = parser.add_mutually_exclusive_group()
+    profile_group.add_argument('--profile', action='store_true',
+                               help="Profil waktu per tahap (sampling stack lintas thread), simpan ke "
+                                    "kompas_profile_stacks.txt & kompas_profile_summary.txt. "
+                                    "Tanpa tracemalloc agar waktu tahap tidak terdistorsi")
+    profile_group.add_argument('--profile-mem', action='store_true',
+                               help="Profil alokasi memori per tahap (tracemalloc), simpan ke "
+                                    "kompas_profile_mem_summary.txt. Berjalan dengan 1 worker agar "
+                                    "alokasi tidak tercampur antar thread (jauh lebih lambat, default dibatasi "
+                                    f"{PROFILE_MEM_MAX_PAGES} halaman); waktu di mode ini tidak representatif")
+    parser.add_argument('--max-pages', type=int, metavar='N',
+                        help=f"Batasi jumlah halaman yang di-scrape (default {MAX_PAGES}, "
+                             f"atau {PROFILE_MEM_MAX_PAGES} dengan --profile-mem)")
+    args = parser.parse_args()
+
+    if args.profile_mem:
+        MAX_WORKERS = 1
+        MAX_PAGES = PROFILE_MEM_MAX_PAGES
+    if args.max_pages:
+        MAX_PAGES = args.max_pages
+
+    with profile_run('kompas_profile', enabled=args.profile or args.profile_mem, memory=args.profile_mem):
+        main()
\ No newline at end of file
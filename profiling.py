@@ -0,0 +1,326 @@
+import fnmatch
+import os
+import re
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from functools import wraps
+
+# Konfigurasi profiling
+SAMPLE_INTERVAL = 0.005  # Jarak antar sampel stack (detik)
+TOP_N = 20  # Jumlah baris teratas di ringkasan
+TRACEMALLOC_FRAMES = 1  # Cukup frame teratas, snapshot dikelompokkan per 'lineno'
+
+_active = None
+
+# Modul yang dipakai filter snapshot itu sendiri (cache pola fnmatch + kompilasi regex)
+_RE_FILES = (os.path.join(os.path.dirname(re.__file__), '*')
+             if os.path.basename(re.__file__) == '__init__.py' else re.__file__)
+
+
+def _frame_label(frame):
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class ScrapeProfiler:
+    """Profiler per tahap pipeline: waktu (sampling lintas thread) atau memori (tracemalloc)
+
+    Kedua mode sengaja dipisah: tracemalloc memperlambat kode yang banyak alokasi
+    (parse, ekspor) jauh lebih besar daripada sleep/network, sehingga ranking
+    waktu antar tahap jadi tidak valid bila keduanya aktif bersamaan.
+    """
+
+    def __init__(self, output_prefix, memory=False, interval=SAMPLE_INTERVAL, top_n=TOP_N):
+        self.output_prefix = output_prefix
+        self.memory = memory
+        self.interval = interval
+        self.top_n = top_n
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._sampler = None
+        self._owns_tracemalloc = False
+        self._phase = None  # fase aktif di thread main, jadi akar stack worker
+        self._thread_stages = {}  # ident thread -> list nama tahap (bersarang)
+        self._open_allocs = []  # record alokasi tahap yang sedang terbuka (mode memori)
+        self.stacks = Counter()  # collapsed stack -> jumlah sampel
+        self.stage_samples = Counter()  # jalur tahap -> jumlah sampel
+        self.leaf_samples = defaultdict(Counter)  # jalur tahap -> fungsi teratas -> sampel
+        self.stage_times = defaultdict(lambda: [0, 0.0, 0.0])  # jalur -> [panggilan, total, maks]
+        self.phase_times = {}  # fase -> durasi wall clock
+        self.stage_allocs = defaultdict(lambda: [0, 0, 0, 0])  # jalur -> [panggilan, total net, total puncak, maks puncak]
+        self.phase_allocs = []  # (fase, diff snapshot, puncak memori)
+        self.started_at = None
+        self.elapsed = 0.0
+
+    def start(self):
+        self.started_at = time.perf_counter()
+        if self.memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(TRACEMALLOC_FRAMES)
+                self._owns_tracemalloc = True
+            # Pemanasan: cache filter sudah terisi sebelum baseline snapshot fase pertama
+            self._take_snapshot()
+        else:
+            self._sampler = threading.Thread(target=self._sample_loop, name="profiler-sampler", daemon=True)
+            self._sampler.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._sampler is not None:
+            self._sampler.join()
+        self.elapsed = time.perf_counter() - self.started_at
+        if self._owns_tracemalloc:
+            tracemalloc.stop()
+
+    def _sample_loop(self):
+        own_ident = threading.get_ident()
+        while not self._stop_event.wait(self.interval):
+            frames = sys._current_frames()
+            # Ambil tahap semua thread segera setelah frame, sebelum stack ditelusuri
+            phase = self._phase
+            thread_stages = {ident: tuple(self._thread_stages.get(ident, ())) for ident in frames}
+
+            for ident, frame in frames.items():
+                # Thread tanpa tahap aktif (worker idle, main yang menunggu, monitor tqdm) tidak dihitung
+                stages = thread_stages[ident]
+                if ident == own_ident or not stages:
+                    continue
+
+                labels = []
+                while frame is not None:
+                    labels.append(_frame_label(frame))
+                    frame = frame.f_back
+                labels.reverse()
+
+                stage_path = self._stage_path(phase, stages)
+                with self._lock:
+                    self.stacks[f"{stage_path};{';'.join(labels)}"] += 1
+                    self.stage_samples[stage_path] += 1
+                    self.leaf_samples[stage_path][labels[-1]] += 1
+
+    @staticmethod
+    def _stage_path(phase, stages):
+        return ';'.join((phase,) + tuple(stages) if phase else stages)
+
+    def _fold_peak(self):
+        # Puncak sejak batas tahap terakhir dibagikan ke semua tahap yang masih terbuka
+        current, peak = tracemalloc.get_traced_memory()
+        for record in self._open_allocs:
+            record[1] = max(record[1], peak)
+        tracemalloc.reset_peak()
+        return current
+
+    @contextmanager
+    def stage(self, name):
+        ident = threading.get_ident()
+        stages = self._thread_stages.setdefault(ident, [])
+        stages.append(name)
+        stage_path = self._stage_path(self._phase, stages)
+
+        if self.memory:
+            with self._lock:
+                current = self._fold_peak()
+                alloc_record = [current, current]  # [memori awal, puncak]
+                self._open_allocs.append(alloc_record)
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            stages.pop()
+            with self._lock:
+                record = self.stage_times[stage_path]
+                record[0] += 1
+                record[1] += duration
+                record[2] = max(record[2], duration)
+
+                if self.memory:
+                    current = self._fold_peak()
+                    self._open_allocs.remove(alloc_record)
+                    start_mem, peak = alloc_record
+                    allocs = self.stage_allocs[stage_path]
+                    allocs[0] += 1
+                    allocs[1] += current - start_mem
+                    allocs[2] += peak - start_mem
+                    allocs[3] = max(allocs[3], peak - start_mem)
+
+    @contextmanager
+    def phase(self, name):
+        # Fase tidak ikut disampling; hanya jadi akar jalur tahap worker
+        self._phase = name
+        if self.memory:
+            before = self._take_snapshot()
+            with self._lock:
+                current = self._fold_peak()
+                alloc_record = [current, current]
+                self._open_allocs.append(alloc_record)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phase_times[name] = time.perf_counter() - start
+            self._phase = None
+            if self.memory:
+                with self._lock:
+                    self._fold_peak()
+                    self._open_allocs.remove(alloc_record)
+                diff = self._take_snapshot().compare_to(before, 'lineno')[:self.top_n]
+                self.phase_allocs.append((name, diff, alloc_record[1]))
+
+    def _take_snapshot(self):
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, fnmatch.__file__),
+            tracemalloc.Filter(False, _RE_FILES),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        ))
+
+    def write(self):
+        """Tulis collapsed stack (siap flamegraph) dan ringkasan top-N"""
+        paths = []
+        if not self.memory:
+            stacks_path = f"{self.output_prefix}_stacks.txt"
+            with open(stacks_path, 'w', encoding='utf-8') as f:
+                for stack, count in self.stacks.most_common():
+                    f.write(f"{stack} {count}\n")
+            paths.append(stacks_path)
+
+        summary_path = f"{self.output_prefix}_{'mem_' if self.memory else ''}summary.txt"
+        with open(summary_path, 'w', encoding='utf-8') as f:
+            f.write(self._format_memory_summary() if self.memory else self._format_time_summary())
+        paths.append(summary_path)
+
+        return paths
+
+    def _format_phase_times(self):
+        lines = ["== Waktu per fase (wall clock) =="]
+        for name, duration in self.phase_times.items():
+            lines.append(f"{name:<40} {duration:>10.2f} s")
+        return lines
+
+    def _format_time_summary(self):
+        lines = [
+            f"Durasi total: {self.elapsed:.2f} detik",
+            f"Interval sampel: {self.interval * 1000:.1f} ms, total sampel: {sum(self.stage_samples.values())}",
+            "",
+        ]
+        lines += self._format_phase_times()
+        lines += [
+            "",
+            "== Waktu per tahap (dijumlahkan lintas thread) ==",
+            f"{'tahap':<40} {'panggilan':>10} {'total(s)':>10} {'self(s)':>10} {'rata2(ms)':>10} {'maks(ms)':>10}",
+        ]
+        for stage_path, (calls, total, longest) in sorted(self.stage_times.items(), key=lambda item: -item[1][1]):
+            # Waktu self = total dikurangi waktu sub-tahap langsungnya
+            children = sum(
+                child[1] for path, child in self.stage_times.items()
+                if path.startswith(stage_path + ';') and ';' not in path[len(stage_path) + 1:]
+            )
+            lines.append(
+                f"{stage_path:<40} {calls:>10} {total:>10.2f} {total - children:>10.2f} "
+                f"{total / calls * 1000:>10.1f} {longest * 1000:>10.1f}"
+            )
+
+        lines += ["", f"== Top {self.top_n} fungsi per tahap (sampel di puncak stack) =="]
+        for stage_path, samples in self.stage_samples.most_common():
+            lines.append(f"[{stage_path}] {samples} sampel")
+            for label, count in self.leaf_samples[stage_path].most_common(self.top_n):
+                lines.append(f"  {count:>8} {count / samples:>7.1%}  {label}")
+
+        return '\n'.join(lines) + '\n'
+
+    def _format_memory_summary(self):
+        lines = [
+            f"Durasi total: {self.elapsed:.2f} detik (tracemalloc aktif, waktu tidak representatif)",
+            "",
+        ]
+        lines += self._format_phase_times()
+        lines += [
+            "",
+            "== Alokasi per tahap (tracemalloc) ==",
+            "net rata2 = rata-rata per panggilan memori yang masih hidup saat tahap selesai.",
+            "  Net positif di sub-tahap (mis. parse) hanya berarti objeknya (soup) masih dipakai",
+            "  tahap induk; cek net tahap induk (mis. artikel) untuk retensi yang sebenarnya.",
+            "puncak = kenaikan memori tertinggi per panggilan, termasuk yang sudah dibebaskan.",
+            "Angka dihitung dari total proses, jadi jalankan dengan satu worker agar tidak tercampur.",
+            f"{'tahap':<40} {'panggilan':>10} {'net rata2(KiB)':>15} {'puncak rata2(KiB)':>18} {'puncak maks(KiB)':>17}",
+        ]
+        for stage_path, (calls, net, peak_total, peak_max) in sorted(
+                self.stage_allocs.items(), key=lambda item: -item[1][2]):
+            lines.append(
+                f"{stage_path:<40} {calls:>10} {net / calls / 1024:>+15.1f} "
+                f"{peak_total / calls / 1024:>18.1f} {peak_max / 1024:>17.1f}"
+            )
+
+        lines += [
+            "",
+            f"== Top {self.top_n} lokasi memori tertahan per fase (net, bukan volume alokasi) ==",
+        ]
+        for name, diff, peak in self.phase_allocs:
+            lines.append(f"[{name}] puncak memori: {peak / 1024 / 1024:.1f} MiB")
+            for stat in diff:
+                frame = stat.traceback[0]
+                lines.append(
+                    f"  {stat.size_diff / 1024:>+10.1f} KiB {stat.count_diff:>+8} blok  "
+                    f"{frame.filename}:{frame.lineno}"
+                )
+
+        return '\n'.join(lines) + '\n'
+
+
+@contextmanager
+def stage(name):
+    """Tandai tahap pipeline di thread saat ini (no-op jika profiling mati)"""
+    if _active is None:
+        yield
+        return
+    with _active.stage(name):
+        yield
+
+
+@contextmanager
+def phase(name):
+    """Tandai fase utama di thread main; tahap worker berakar pada fase ini"""
+    if _active is None:
+        yield
+        return
+    with _active.phase(name):
+        yield
+
+
+def profiled(name):
+    """Decorator untuk menandai seluruh fungsi worker sebagai satu tahap"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def profile_run(output_prefix, enabled=True, memory=False):
+    """Jalankan blok dengan profiling waktu (atau memori jika memory=True) lalu tulis hasilnya"""
+    global _active
+    if not enabled:
+        yield None
+        return
+
+    profiler = ScrapeProfiler(output_prefix, memory=memory)
+    _active = profiler
+    profiler.start()
+    try:
+        yield profiler
+    finally:
+        profiler.stop()
+        _active = None
+        paths = profiler.write()
+        print(f"\n⏱️ Profil disimpan: {', '.join(paths)}")
@@ -8,9 +8,12 @@ from urllib3.util.retry import Retry
 from requests.adapters import HTTPAdapter
 from tqdm import tqdm
 import logging
+import argparse
+from profiling import profile_run, profiled, phase, stage
 
 # Konfigurasi
 MAX_PAGES = 500  # 500 halaman x ~20 artikel = 10.000 data
+PROFILE_MEM_MAX_PAGES = 5  # Batas halaman default untuk --profile-mem (1 worker)
 MAX_WORKERS = 5  # Lebih kecil untuk mengurangi timeout
 DELAY_RANGE = (2, 5)  # Delay antara request (detik)
 REQUEST_TIMEOUT = (10, 30)  # (connect timeout, read timeout)
@@ -64,14 +67,19 @@ def create_session():
     
     return session
 
+@profiled('artikel')
 def scrape_article(url, session):
     """Scrape konten artikel individual"""
     try:
-        time.sleep(get_random_delay())
-        response = session.get(url, timeout=REQUEST_TIMEOUT)
+        with stage('jeda'):
+            time.sleep(get_random_delay())
+        with stage('fetch'):
+            response = session.get(url, timeout=REQUEST_TIMEOUT)
+            html = response.text  # decode body (+ deteksi charset) masuk ke fetch, bukan parse
         response.raise_for_status()
         
-        soup = BeautifulSoup(response.text, 'html.parser')
+        with stage('parse'):
+            soup = BeautifulSoup(html, 'html.parser')
         
         # Ekstrak teks lengkap
         entry_content = soup.find('div', class_='entry-content')
@@ -110,15 +118,20 @@ def scrape_article(url, session):
             'error': error_msg
         }
 
+@profiled('halaman')
 def scrape_page(page_num, session):
     """Scrape list artikel dalam satu halaman"""
     try:
-        time.sleep(get_random_delay())
+        with stage('jeda'):
+            time.sleep(get_random_delay())
         url = f"https://turnbackhoax.id/page/{page_num}/"
-        response = session.get(url, timeout=REQUEST_TIMEOUT)
+        with stage('fetch'):
+            response = session.get(url, timeout=REQUEST_TIMEOUT)
+            html = response.text  # decode body (+ deteksi charset) masuk ke fetch, bukan parse
         response.raise_for_status()
         
-        soup = BeautifulSoup(response.text, 'html.parser')
+        with stage('parse'):
+            soup = BeautifulSoup(html, 'html.parser')
         articles = soup.find_all('article', class_='mh-loop-item')
         
         page_data = []
@@ -171,7 +184,7 @@ def main():
     
     # Tahap 1: Scrape semua URL artikel
     print("\n🔍 Mengumpulkan URL artikel...")
-    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+    with phase('kumpul_url'), ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
         futures = {executor.submit(scrape_page, page_num, session): page_num 
                   for page_num in range(1, MAX_PAGES + 1)}
         
@@ -189,7 +202,7 @@ def main():
     print("\n📖 Mengambil konten artikel...")
     url_to_index = {article['Url']: idx for idx, article in enumerate(all_data)}
     
-    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+    with phase('konten'), ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
         futures = {executor.submit(scrape_article, article['Url'], session): article['Url'] 
                  for article in all_data}
         
@@ -205,22 +218,25 @@ def main():
     
     # Simpan hasil
     print("\n💾 Menyimpan hasil...")
-    df = pd.DataFrame(all_data)
-    
-    # Simpan per chunk
-    chunk_size = 2000
-    for i in range(0, len(df), chunk_size):
-        chunk = df.iloc[i:i + chunk_size]
-
-        # Simpan ke XLSX
-        xlsx_output = f"turnbackhoax_data_part_{i//chunk_size + 1}.xlsx"
-        chunk.to_excel(xlsx_output, index=False)
-        print(f"Disimpan (XLSX): {xlsx_output} ({len(chunk)} data)")
+    with phase('ekspor'):
+        df = pd.DataFrame(all_data)
         
-        # Simpan ke CSV
-        csv_output = f"turnbackhoax_data_part_{i//chunk_size + 1}.csv"
-        chunk.to_csv(csv_output, index=False, encoding='utf-8-sig')
-        print(f"Disimpan (CSV): {csv_output} ({len(chunk)} data)")
+        # Simpan per chunk
+        chunk_size = 2000
+        for i in range(0, len(df), chunk_size):
+            chunk = df.iloc[i:i + chunk_size]
+
+            # Simpan ke XLSX
+            xlsx_output = f"turnbackhoax_data_part_{i//chunk_size + 1}.xlsx"
+            with stage('xlsx'):
+                chunk.to_excel(xlsx_output, index=False)
+            print(f"Disimpan (XLSX): {xlsx_output} ({len(chunk)} data)")
+            
+            # Simpan ke CSV
+            csv_output = f"turnbackhoax_data_part_{i//chunk_size + 1}.csv"
+            with stage('csv'):
+                chunk.to_csv(csv_output, index=False, encoding='utf-8-sig')
+            print(f"Disimpan (CSV): {csv_output} ({len(chunk)} data)")
     
     # Simpan URL yang error
     error_urls = [article['Url'] for article in all_data if article['FullText'] == "N/A"]
@@ -232,4 +248,27 @@ def main():
     print("\n🎉 Selesai! Semua data telah disimpan.")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Scraper TurnBackHoax")
+    profile_group = parser.add_mutually_exclusive_group()
+    profile_group.add_argument('--profile', action='store_true',
+                               help="Profil waktu per tahap (sampling stack lintas thread), simpan ke "
+                                    "turnbackhoax_profile_stacks.txt & turnbackhoax_profile_summary.txt. "
+                                    "Tanpa tracemalloc agar waktu tahap tidak terdistorsi")
+    profile_group.add_argument('--profile-mem', action='store_true',
+                               help="Profil alokasi memori per tahap (tracemalloc), simpan ke "
+                                    "turnbackhoax_profile_mem_summary.txt. Berjalan dengan 1 worker agar "
+                                    "alokasi tidak tercampur antar thread (jauh lebih lambat, default dibatasi "
+                                    f"{PROFILE_MEM_MAX_PAGES} halaman); waktu di mode ini tidak representatif")
+    parser.add_argument('--max-pages', type=int, metavar='N',
+                        help=f"Batasi jumlah halaman yang di-scrape (default {MAX_PAGES}, "
+                             f"atau {PROFILE_MEM_MAX_PAGES} dengan --profile-mem)")
+    args = parser.parse_args()
+
+    if args.profile_mem:
+        MAX_WORKERS = 1
+        MAX_PAGES = PROFILE_MEM_MAX_PAGES
+    if args.max_pages:
+        MAX_PAGES = args.max_pages
+
+    with profile_run('turnbackhoax_profile', enabled=args.profile or args.profile_mem, memory=args.profile_mem):
+        main()
\ No newline at end of file